@@ -1,20 +1,56 @@
-from fastapi import FastAPI, Depends, HTTPException, Security
+from fastapi import FastAPI, Depends, HTTPException, Security, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import SQLModel, Field, create_engine, Session, Relationship, select, delete
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.redis import RedisBackend
+from fastapi_cache.decorator import cache
+from redis import asyncio as aioredis
+from redis.exceptions import RedisError
+from sqlmodel import SQLModel, Field, Relationship, select, delete, text
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.orm import raiseload
 from typing import Optional, List, Annotated
-import os, time
+from contextlib import asynccontextmanager
+import os, time, hmac, logging
+
+logger = logging.getLogger(__name__)
 
 DATABASE_URL = os.getenv("DATABASE_URL", "postgresql://user:password@db/dbname")
-engine = create_engine(DATABASE_URL, echo=True)
+# Route the connection through the asyncpg driver so queries don't block the event loop
+engine = create_async_engine(
+    DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1),
+    pool_size=32,          # connections kept open between requests
+    max_overflow=16,       # extra connections allowed under bursts
+    pool_timeout=30,       # seconds to wait for a free connection before failing
+    pool_pre_ping=True,    # detect connections dropped by the server before use
+    pool_recycle=3600,     # reopen connections older than an hour
+    echo=False,
+)
+
+# Response cache for read endpoints
+REDIS_URL = os.getenv("REDIS_URL", "redis://redis:6379")
+CACHE_EXPIRE = 3600
+CACHE_PREFIX = "gw"
+# Cached GET route of each cache namespace, formatted with the requested id
+CACHE_ROUTES = {
+    "workflow": "/workflows/{}",
+    "process": "/processes/{}",
+    "parameters": "/parameters/{}",
+    "input_files": "/input_files/{}",
+    "output_files": "/output_files/{}",
+}
+redis_client = aioredis.from_url(REDIS_URL)
 
 # API Key Authentication
 API_KEY = os.getenv("API_KEY")
 if not API_KEY:
     raise EnvironmentError("Missing API_KEY environment variable")
+API_KEY_BYTES = API_KEY.encode()
 security = HTTPBearer()
 
-def verify_api_key(credentials: HTTPAuthorizationCredentials = Security(security)):
-    if credentials.credentials != API_KEY:
+async def verify_api_key(credentials: HTTPAuthorizationCredentials = Security(security)):
+    # Constant-time comparison so response timing doesn't reveal how much of the key matched
+    if not hmac.compare_digest(credentials.credentials.encode(), API_KEY_BYTES):
         raise HTTPException(
             status_code=401, # Unauthorized
             detail="Invalid API Key"
@@ -29,18 +65,17 @@ class ProcessExecutionParameterInput(SQLModel, table=True):
 
     process_execution: Optional["ProcessExecution"] = Relationship(back_populates="parameters")
 
-class ProcessExecutionInputFile(SQLModel, table=True):
+# Bulk endpoints validate rows against the plain *Base models; building
+# SQLAlchemy-instrumented table instances costs several times more per row
+class ProcessExecutionFileBase(SQLModel):
     process_execution_id: str = Field(foreign_key="processexecution.id", primary_key=True)
     filename: str = Field(primary_key=True)
     xxhash128: str = None
 
+class ProcessExecutionInputFile(ProcessExecutionFileBase, table=True):
     process_execution: Optional["ProcessExecution"] = Relationship(back_populates="input_files")
 
-class ProcessExecutionOutputFile(SQLModel, table=True):
-    process_execution_id: str = Field(foreign_key="processexecution.id", primary_key=True)
-    filename: str = Field(primary_key=True)
-    xxhash128: str = None
-
+class ProcessExecutionOutputFile(ProcessExecutionFileBase, table=True):
     process_execution: Optional["ProcessExecution"] = Relationship(back_populates="output_files")
 
 
@@ -56,9 +91,9 @@ class WorkflowExecution(SQLModel, table=True):
     process_executions: List["ProcessExecution"] = Relationship(back_populates="workflow_execution")
 
 
-class ProcessExecution(SQLModel, table=True):
+class ProcessExecutionBase(SQLModel):
     id: str = Field(primary_key=True)
-    workflow_execution_id: str = Field(foreign_key="workflowexecution.id")
+    workflow_execution_id: str = Field(foreign_key="workflowexecution.id", index=True)
     process_name: str
     module_name: Optional[str] = None
     container_name: Optional[str] = None
@@ -79,6 +114,7 @@ class ProcessExecution(SQLModel, table=True):
     read_char: float
     write_char: float
 
+class ProcessExecution(ProcessExecutionBase, table=True):
     workflow_execution: Optional[WorkflowExecution] = Relationship(back_populates="process_executions")
     parameters: List[ProcessExecutionParameterInput] = Relationship(back_populates="process_execution")
     input_files: List[ProcessExecutionInputFile] = Relationship(back_populates="process_execution")
@@ -86,116 +122,197 @@ class ProcessExecution(SQLModel, table=True):
 
 
 # App and DB dependency
-app = FastAPI()
-
-def get_session():
-    with Session(engine) as session:
+async def get_session():
+    # Keep instances loaded after commit so created rows can be returned
+    # as-is instead of being re-read with a SELECT
+    async with AsyncSession(engine, expire_on_commit=False) as session:
         yield session
 
-@app.on_event("startup")
-def on_startup():
-    SQLModel.metadata.create_all(engine)
+# Cache keys only depend on the requested path; the default builder also hashes
+# the per-request session object, so it would never produce a hit
+def request_key_builder(func, namespace: str = "", *, request: Request = None, response=None, args=(), kwargs=None):
+    return f"{namespace}:{request.url.path}"
+
+def cache_key(namespace: str, id: str) -> str:
+    return f"{CACHE_PREFIX}:{namespace}:{CACHE_ROUTES[namespace].format(id)}"
+
+# Only the entries of the written ids are dropped. The cache is best-effort:
+# writes are already committed, so a Redis outage is logged instead of failing them
+async def invalidate_cache(*keys: str):
+    if not keys:
+        return
+    try:
+        await redis_client.delete(*set(keys))
+    except RedisError as e:
+        logger.warning(f"Cache invalidation failed: {e}")
+
+# Bulk rows are streamed with COPY into a temporary staging table and merged
+# from there, since COPY on its own can't skip rows that already exist.
+# Returns how many rows were inserted
+async def copy_insert(session: AsyncSession, model, rows: list, conflict_columns: list) -> int:
+    table = model.__table__.name
+    staging = f"staging_{table}"
+    columns = [column.name for column in model.__table__.columns]
+    await session.exec(text(f"CREATE TEMPORARY TABLE {staging} (LIKE {table}) ON COMMIT DROP"))
+    connection = await (await session.connection()).get_raw_connection()
+    await connection.driver_connection.copy_records_to_table(staging, records=[tuple(getattr(row, column) for column in columns) for row in rows], columns=columns)
+    result = await session.exec(text(f"INSERT INTO {table} SELECT * FROM {staging} ON CONFLICT ({', '.join(conflict_columns)}) DO NOTHING"))
+    return result.rowcount
+
+# The schema is managed by Alembic (`alembic upgrade head`, run by the migrate
+# service) so workers only check that the database is reachable on startup
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+    FastAPICache.init(RedisBackend(redis_client), prefix=CACHE_PREFIX, key_builder=request_key_builder)
+    yield
+    await engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
 
 # Routes
 
 @app.post("/workflows/", response_model=WorkflowExecution)
-def create_workflow(
+async def create_workflow(
     execution: WorkflowExecution, 
-    session: Session = Depends(get_session), 
+    session: AsyncSession = Depends(get_session), 
     api_key: str = Depends(verify_api_key)
 ):
     session.add(execution)
-    session.commit()
-    session.refresh(execution)
+    await session.commit()
+    await invalidate_cache(cache_key("workflow", execution.id))
     return execution
 
 @app.get("/workflows/{execution_id}", response_model=WorkflowExecution)
-def get_workflow(execution_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    workflow = session.get(WorkflowExecution, execution_id)
+@cache(expire=CACHE_EXPIRE, namespace="workflow")
+async def get_workflow(execution_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    workflow = await session.get(WorkflowExecution, execution_id, options=[raiseload("*")])
     if not workflow:
         raise HTTPException(status_code=404, detail="Workflow not found")
     return workflow
 
 @app.post("/processes/", response_model=ProcessExecution)
-def create_process(process: ProcessExecution, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
+async def create_process(process: ProcessExecution, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
     session.add(process)
-    session.commit()
-    session.refresh(process)
+    await session.commit()
+    await invalidate_cache(cache_key("process", process.id))
     return process
 
+# Bulk inserts skip rows that already exist, so a client can safely resend a batch
+@app.post("/processes/bulk")
+async def create_processes(processes: List[ProcessExecutionBase], session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    created = 0
+    if processes:
+        created = await copy_insert(session, ProcessExecution, processes, ["id"])
+        await session.commit()
+        await invalidate_cache(*(cache_key("process", process.id) for process in processes))
+    return {"message": f"{created} processes created successfully"}
+
 @app.get("/processes/{process_id}", response_model=ProcessExecution)
-def get_process(process_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    process = session.get(ProcessExecution, process_id)
+@cache(expire=CACHE_EXPIRE, namespace="process")
+async def get_process(process_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    # Relationships aren't part of the response; fail loudly instead of lazy-loading them
+    process = await session.get(ProcessExecution, process_id, options=[raiseload("*")])
     if not process:
         raise HTTPException(status_code=404, detail="Process not found")
     return process
 
 @app.delete("/processes/{process_id}")
-def delete_process(process_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    process = session.get(ProcessExecution, process_id)
-    if not process:
+async def delete_process(process_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    # Remove dependent rows with set-based DELETEs; deleting through the ORM would
+    # load each relationship and try to null out their primary key columns
+    for model in (ProcessExecutionParameterInput, ProcessExecutionInputFile, ProcessExecutionOutputFile):
+        await session.exec(delete(model).where(model.process_execution_id == process_id))
+    result = await session.exec(delete(ProcessExecution).where(ProcessExecution.id == process_id))
+    if result.rowcount == 0:
+        await session.rollback()
         raise HTTPException(status_code=404, detail="Process not found")
-    session.delete(process)
-    session.commit()
+    await session.commit()
+    await invalidate_cache(*(cache_key(namespace, process_id) for namespace in ("process", "parameters", "input_files", "output_files")))
     return {"message": "Process deleted successfully"}
 
 @app.post("/parameters/", response_model=ProcessExecutionParameterInput)
-def create_parameter(param: ProcessExecutionParameterInput, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
+async def create_parameter(param: ProcessExecutionParameterInput, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
     session.add(param)
-    session.commit()
-    session.refresh(param)
+    await session.commit()
+    await invalidate_cache(cache_key("parameters", param.process_execution_id))
     return param
 
 @app.get("/parameters/{process_id}", response_model=List[ProcessExecutionParameterInput])
-def get_parameters(process_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    result = session.exec(select(ProcessExecutionParameterInput).where(ProcessExecutionParameterInput.process_execution_id == process_id)).all()
+@cache(expire=CACHE_EXPIRE, namespace="parameters")
+async def get_parameters(process_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    result = (await session.exec(select(ProcessExecutionParameterInput).where(ProcessExecutionParameterInput.process_execution_id == process_id))).all()
     return result
 
 @app.delete("/parameters/{process_id}")
-def delete_parameters(process_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    session.exec(
+async def delete_parameters(process_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    await session.exec(
         delete(ProcessExecutionParameterInput)
         .where(ProcessExecutionParameterInput.process_execution_id == process_id)
     )
-    session.commit()
+    await session.commit()
+    await invalidate_cache(cache_key("parameters", process_id))
     return {"message": "Parameters deleted successfully"}
 
 @app.post("/input_files/", response_model=ProcessExecutionInputFile)
-def create_input_file(file: ProcessExecutionInputFile, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
+async def create_input_file(file: ProcessExecutionInputFile, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
     session.add(file)
-    session.commit()
-    session.refresh(file)
+    await session.commit()
+    await invalidate_cache(cache_key("input_files", file.process_execution_id))
     return file
 
+@app.post("/input_files/bulk")
+async def create_input_files(files: List[ProcessExecutionFileBase], session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    created = 0
+    if files:
+        created = await copy_insert(session, ProcessExecutionInputFile, files, ["process_execution_id", "filename"])
+        await session.commit()
+        await invalidate_cache(*(cache_key("input_files", file.process_execution_id) for file in files))
+    return {"message": f"{created} input files created successfully"}
+
 @app.get("/input_files/{process_id}", response_model=List[ProcessExecutionInputFile])
-def get_input_files(process_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    return session.exec(select(ProcessExecutionInputFile).where(ProcessExecutionInputFile.process_execution_id == process_id)).all()
+@cache(expire=CACHE_EXPIRE, namespace="input_files")
+async def get_input_files(process_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    return (await session.exec(select(ProcessExecutionInputFile).where(ProcessExecutionInputFile.process_execution_id == process_id))).all()
 
 @app.delete("/input_files/{process_id}")
-def delete_input_files(process_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    session.exec(
+async def delete_input_files(process_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    await session.exec(
         delete(ProcessExecutionInputFile)
         .where(ProcessExecutionInputFile.process_execution_id == process_id)
     )
-    session.commit()
+    await session.commit()
+    await invalidate_cache(cache_key("input_files", process_id))
     return {"message": "Input files deleted successfully"}
 
 @app.post("/output_files/", response_model=ProcessExecutionOutputFile)
-def create_output_file(file: ProcessExecutionOutputFile, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
+async def create_output_file(file: ProcessExecutionOutputFile, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
     session.add(file)
-    session.commit()
-    session.refresh(file)
+    await session.commit()
+    await invalidate_cache(cache_key("output_files", file.process_execution_id))
     return file
 
+@app.post("/output_files/bulk")
+async def create_output_files(files: List[ProcessExecutionFileBase], session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    created = 0
+    if files:
+        created = await copy_insert(session, ProcessExecutionOutputFile, files, ["process_execution_id", "filename"])
+        await session.commit()
+        await invalidate_cache(*(cache_key("output_files", file.process_execution_id) for file in files))
+    return {"message": f"{created} output files created successfully"}
+
 @app.get("/output_files/{process_id}", response_model=List[ProcessExecutionOutputFile])
-def get_output_files(process_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    return session.exec(select(ProcessExecutionOutputFile).where(ProcessExecutionOutputFile.process_execution_id == process_id)).all()
+@cache(expire=CACHE_EXPIRE, namespace="output_files")
+async def get_output_files(process_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    return (await session.exec(select(ProcessExecutionOutputFile).where(ProcessExecutionOutputFile.process_execution_id == process_id))).all()
 
 @app.delete("/output_files/{process_id}")
-def delete_output_files(process_id: str, session: Session = Depends(get_session), api_key: str = Depends(verify_api_key)):
-    session.exec(
+async def delete_output_files(process_id: str, session: AsyncSession = Depends(get_session), api_key: str = Depends(verify_api_key)):
+    await session.exec(
         delete(ProcessExecutionOutputFile)
         .where(ProcessExecutionOutputFile.process_execution_id == process_id)
     )
-    session.commit()
+    await session.commit()
+    await invalidate_cache(cache_key("output_files", process_id))
     return {"message": "Output files deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Databases created before migrations were added already have these tables
+    # from SQLModel.metadata.create_all; adopt them as they are
+    if not op.get_context().as_sql and sa.inspect(op.get_bind()).has_table('workflowexecution'):
+        return
+    op.create_table('workflowexecution',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('start_time', sa.Float(), nullable=True),
+    sa.Column('duration', sa.Float(), nullable=True),
+    sa.Column('run_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('nextflow_version', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('final_state', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('revision_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('processexecution',
+    sa.Column('id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('workflow_execution_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('process_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('module_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('container_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('final_status', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('exit_code', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.Float(), nullable=False),
+    sa.Column('duration', sa.Float(), nullable=False),
+    sa.Column('cpus_requested', sa.Float(), nullable=True),
+    sa.Column('time_requested', sa.Float(), nullable=True),
+    sa.Column('storage_requested', sa.Float(), nullable=True),
+    sa.Column('memory_requested', sa.Float(), nullable=True),
+    sa.Column('realtime', sa.Float(), nullable=False),
+    sa.Column('queue_name', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('percent_cpu', sa.Float(), nullable=False),
+    sa.Column('percent_memory', sa.Float(), nullable=False),
+    sa.Column('peak_rss', sa.Float(), nullable=False),
+    sa.Column('peak_vmem', sa.Float(), nullable=False),
+    sa.Column('read_char', sa.Float(), nullable=False),
+    sa.Column('write_char', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['workflow_execution_id'], ['workflowexecution.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_table('processexecutioninputfile',
+    sa.Column('process_execution_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('filename', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('xxhash128', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['process_execution_id'], ['processexecution.id'], ),
+    sa.PrimaryKeyConstraint('process_execution_id', 'filename')
+    )
+    op.create_table('processexecutionoutputfile',
+    sa.Column('process_execution_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('filename', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('xxhash128', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['process_execution_id'], ['processexecution.id'], ),
+    sa.PrimaryKeyConstraint('process_execution_id', 'filename')
+    )
+    op.create_table('processexecutionparameterinput',
+    sa.Column('process_execution_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('parameter_name', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('parameter_value', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.ForeignKeyConstraint(['process_execution_id'], ['processexecution.id'], ),
+    sa.PrimaryKeyConstraint('process_execution_id', 'parameter_name')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('processexecutionparameterinput')
+    op.drop_table('processexecutionoutputfile')
+    op.drop_table('processexecutioninputfile')
+    op.drop_table('processexecution')
+    op.drop_table('workflowexecution')
@@ -0,0 +1,31 @@
+"""index processexecution.workflow_execution_id
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, Sequence[str], None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY avoids locking processexecution against writes but can't run in a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(op.f('ix_processexecution_workflow_execution_id'), 'processexecution', ['workflow_execution_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_processexecution_workflow_execution_id'), table_name='processexecution', postgresql_concurrently=True)
@@ -1,12 +1,20 @@
 import typer
-import requests
-import json
+import httpx
+import asyncio
+import orjson
+import ijson
+import csv
 import subprocess
 import re
 #import hashlib
 import os
+import mmap
+import sqlite3
 import xxhash
 from urllib.parse import urlparse, unquote
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
 from dotenv import load_dotenv
@@ -17,103 +25,205 @@ app = typer.Typer()
 
 API_BASE_URL = os.getenv("API_BASE_URL", "http://localhost:80")
 
+# Upper bound on in-flight requests to the API
+MAX_CONCURRENT_REQUESTS = 16
+
+# Rows sent per request to the bulk endpoints
+BULK_BATCH_SIZE = 500
+
+# Read size used when a file can't be memory-mapped for hashing
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Threads used to hash the files of a directory
+HASH_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# File digests keyed by (device, inode, size, mtime), reused within and across runs
+HASH_CACHE_PATH = Path(os.getenv("XDG_CACHE_HOME", Path.home() / ".cache")) / "gw-repo" / "hashes.sqlite"
+file_hash_cache = {}
+hash_cache_disabled = False
+
+# Units of Nextflow durations in the order they appear, e.g. "1d 2h 3m 4.5s" or "250ms"
+DURATION_UNITS = {"d": 0, "h": 1, "m": 2, "s": 3, "ms": 4}
+DURATION_PATTERN = re.compile(r'\s*(?:(\d+\.?\d*)d)?\s*(?:(\d+\.?\d*)h)?\s*(?:(\d+\.?\d*)m)?\s*(?:(\d+\.?\d*)s)?\s*(?:(\d+\.?\d*)ms)?\s*')
+# MB per unit suffix in Nextflow memory values, e.g. "2 GB"
+MEMORY_UNITS = {"KB": 1/1024, "MB": 1, "GB": 1024, "TB": 1024**2}
+TRACE_FILE_PATTERN = re.compile(r"trace file: (/.+\.txt)")
+
 # Converts duration as represented in 'nextflow log' output to seconds
 def duration_to_seconds(duration: str) -> float:
     if duration == "-":
         return 0.0  
-    
-    pattern = re.compile(r'(?:(\d+\.?\d*)d)?\s*(?:(\d+\.?\d*)h)?\s*(?:(\d+\.?\d*)m)?\s*(?:(\d+\.?\d*)s)?\s*(?:(\d+\.?\d*)ms)?')
-    match = pattern.fullmatch(duration.strip())
 
+    # Fast path for space-separated "<number><unit>" tokens in unit order
+    values = [0, 0, 0, 0, 0]
+    last = -1
+    for token in duration.split():
+        number = token.rstrip("dhms")
+        unit = DURATION_UNITS.get(token[len(number):], -1)
+        if unit <= last or not number[:1].isdecimal() or not number.replace(".", "", 1).isdecimal():
+            break
+        values[unit] = float(number)
+        last = unit
+    else:
+        (days, hours, minutes, seconds, milliseconds) = values
+        return days * 86400 + hours * 3600 + minutes * 60 + seconds + milliseconds / 1000
+
+    # Anything else, such as units without spaces ("1h2m"), goes through the full pattern
+    match = DURATION_PATTERN.fullmatch(duration)
     if not match:
         raise ValueError(f"Error in converting duration: {duration}")
 
-    days = float(match.group(1)) if match.group(1) else 0
-    hours = float(match.group(2)) if match.group(2) else 0
-    minutes = float(match.group(3)) if match.group(3) else 0
-    seconds = float(match.group(4)) if match.group(4) else 0
-    milliseconds = float(match.group(5)) if match.group(5) else 0
-
+    (days, hours, minutes, seconds, milliseconds) = (float(group) if group else 0 for group in match.groups())
     return days * 86400 + hours * 3600 + minutes * 60 + seconds + milliseconds / 1000
 
 # Extract Nextflow version from BCO provenance file
-def get_nextflow_version(bco_data: dict):
+def get_nextflow_version(bco_file: Path):
     """Get Nextflow version from BCO file"""
-    nextflow_info = next((item for item in bco_data['execution_domain']['software_prerequisites'] if item['name'] == 'Nextflow'), None)
-    nextflow_version = nextflow_info['version'] if nextflow_info else None
-    return nextflow_version
+    # Stream the prerequisites and stop at the Nextflow entry
+    with open(bco_file, "rb") as f:
+        for item in ijson.items(f, "execution_domain.software_prerequisites.item"):
+            if item["name"] == "Nextflow":
+                return item["version"]
+    return None
 
 # Get file path of trace file from log file
 def get_trace_filepath(log_file: Path) -> Path | None:
-    pattern = re.compile(r"trace file: (/.+\.txt)")
     with open(log_file, "r") as f:
         for line in f:
-            match = pattern.search(line)
+            match = TRACE_FILE_PATTERN.search(line)
             if match:
                 return Path(match.group(1))
     return None    
 
-# Extract latest workflow execution info from 'nextflow log'
-def get_nextflow_log(log_file: Path, bco_data: dict):
-    """Get workflow execution details using nextflow log command"""
-    result = subprocess.run(["nextflow", "log"], capture_output=True, text=True)
-    if result.returncode != 0:
+# Session history written by Nextflow in the launch directory; 'nextflow log'
+# lists its records under these column names
+NEXTFLOW_HISTORY_FILE = Path(".nextflow") / "history"
+NEXTFLOW_LOG_COLUMNS = ["TIMESTAMP", "DURATION", "RUN NAME", "STATUS", "REVISION ID", "SESSION ID", "COMMAND"]
+
+def read_nextflow_history():
+    """Get the latest run from .nextflow/history, or None if it can't be read"""
+    latest = None
+    try:
+        with open(NEXTFLOW_HISTORY_FILE, "r") as f:
+            for line in f:
+                if line.strip():
+                    latest = line
+    except OSError:
+        return None
+    if latest is None:
+        return None
+
+    latest_run = [item.strip() for item in latest.split("\t")]
+    if len(latest_run) != len(NEXTFLOW_LOG_COLUMNS):
+        return None
+    # The history file keeps the full script hash, while 'nextflow log' prints
+    # only its first 10 characters; shorten it so both paths store the same id
+    latest_run[4] = latest_run[4][:10]
+    return dict(zip(NEXTFLOW_LOG_COLUMNS, latest_run))
+
+def run_nextflow_log():
+    """Get the latest run using the nextflow log command"""
+    # Stream the output and keep only the header and the latest run,
+    # rather than buffering the whole session history
+    with subprocess.Popen(["nextflow", "log"], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True) as process:
+        header = next(process.stdout, "")
+        latest = header
+        for line in process.stdout:
+            if line.strip():
+                latest = line
+    if process.returncode != 0:
         typer.echo("Error running 'nextflow log'", err=True)
         return None
-    
-    lines = result.stdout.strip().split("\n")
-    headers = [item.strip() for item in lines[0].split("\t")]
-    latest_run = [item.strip() for item in lines[-1].split("\t")]
 
-    execution_data = dict(zip(headers, latest_run))
+    headers = [item.strip() for item in header.split("\t")]
+    latest_run = [item.strip() for item in latest.split("\t")]
+
+    return dict(zip(headers, latest_run))
+
+# Extract latest workflow execution info from the Nextflow session history
+def get_nextflow_log(log_file: Path, bco_file: Path):
+    """Get workflow execution details of the latest run"""
+    # Reading the history file directly avoids starting a JVM for 'nextflow log',
+    # which remains the fallback when the file is missing or in another format
+    execution_data = read_nextflow_history() or run_nextflow_log()
+    if execution_data is None:
+        return None
 
     return {
         "id": execution_data.get("SESSION ID"),
         "start_time": datetime.strptime(execution_data["TIMESTAMP"], "%Y-%m-%d %H:%M:%S").timestamp(),
         "duration": duration_to_seconds(execution_data.get("DURATION")),
         "run_name": execution_data.get("RUN NAME"),
-        "nextflow_version": get_nextflow_version(bco_data),
+        "nextflow_version": get_nextflow_version(bco_file),
         "revision_id": execution_data.get("REVISION ID"),
         "final_state": execution_data.get("STATUS"),
     }
 
+def memoized(converter):
+    """Wrap converter so that each distinct value is only converted once"""
+    cache = {}
+    def convert(value):
+        try:
+            return cache[value]
+        except KeyError:
+            result = cache[value] = converter(value)
+            return result
+    return convert
+
 # Extract process execution data from Nextflow trace file
 def get_process_execution_data(trace_file, workflow_id): 
-    """Parse Nextflow trace file and extract process execution data"""
-    import uuid
-    
-    with open(trace_file, "r") as f:
-        lines = f.readlines()
-
-    headers = lines[0].strip().split("\t")
-    data = [dict(zip(headers, line.strip().split("\t"))) for line in lines[1:]]
-
-    process_execution_data = []
-    for item in data:
-        process_execution_data.append({
-            "id": item.get('hash'),  
-            "workflow_execution_id": workflow_id,  
-            "process_name": item.get("process"),
-            "module_name": item.get("module"),
-            "container_name": item.get("container"),
-            "final_status": item.get("status"),
-            "exit_code": int(item.get("exit")),
-            "start_time": datetime.strptime(item["start"], "%Y-%m-%d %H:%M:%S.%f").timestamp(),  
-            "duration": duration_to_seconds(item.get("duration")),
-            "cpus_requested": int(item.get("cpus")),
-            "time_requested": duration_to_seconds(item.get("time", "0s")),  
-            "storage_requested": parse_memory_value(item.get("disk", "0 MB")),  
-            "memory_requested": parse_memory_value(item.get("memory", "0 MB")),  
-            "realtime": duration_to_seconds(item.get("realtime", "0s")),
-            "queue_name": item.get("queue"),
-            "percent_cpu": float(item.get("%cpu").rstrip("%")),
-            "percent_memory": float(item.get("%mem").rstrip("%")),
-            "peak_rss": parse_memory_value(item.get("peak_rss")),
-            "peak_vmem": parse_memory_value(item.get("peak_vmem")),
-            "read_char": parse_memory_value(item.get("rchar")),
-            "write_char": parse_memory_value(item.get("wchar")),
-        })    
-    return process_execution_data
+    """Parse Nextflow trace file and yield process execution data row by row"""
+    # (field, trace column, converter, value used when the column is missing)
+    fields = [
+        ("id", "hash", None, None),
+        ("process_name", "process", None, None),
+        ("module_name", "module", None, None),
+        ("container_name", "container", None, None),
+        ("final_status", "status", None, None),
+        ("exit_code", "exit", int, None),
+        # Trace start times are fixed-format local ISO timestamps; fromisoformat is much faster than strptime
+        ("start_time", "start", lambda start: datetime.fromisoformat(start).timestamp(), None),
+        ("duration", "duration", duration_to_seconds, None),
+        ("cpus_requested", "cpus", int, None),
+        ("time_requested", "time", duration_to_seconds, "0s"),
+        ("storage_requested", "disk", parse_memory_value, "0 MB"),
+        ("memory_requested", "memory", parse_memory_value, "0 MB"),
+        ("realtime", "realtime", duration_to_seconds, "0s"),
+        ("queue_name", "queue", None, None),
+        ("percent_cpu", "%cpu", parse_percent_value, None),
+        ("percent_memory", "%mem", parse_percent_value, None),
+        ("peak_rss", "peak_rss", parse_memory_value, None),
+        ("peak_vmem", "peak_vmem", parse_memory_value, None),
+        ("read_char", "rchar", parse_memory_value, None),
+        ("write_char", "wchar", parse_memory_value, None),
+    ]
+
+    with open(trace_file, "r", newline="") as f:
+        reader = csv.reader(f, delimiter="\t", quoting=csv.QUOTE_NONE)
+        headers = [header.strip() for header in next(reader)]
+        index = {header: i for i, header in enumerate(headers)}
+
+        # Exit codes and requested resources take few distinct values, so their
+        # conversions are cached; the measured columns are nearly unique per task
+        # and caching them would grow with the trace
+        repeated = {"exit", "cpus", "time", "disk", "memory"}
+        copied = [(name, index[column]) for name, column, converter, default in fields if converter is None and column in index]
+        converted = [(name, index[column], memoized(converter) if column in repeated else converter) for name, column, converter, default in fields if converter is not None and column in index]
+        constant = {"workflow_execution_id": workflow_id}
+        for name, column, converter, default in fields:
+            if column not in index:
+                constant[name] = converter(default) if converter and default is not None else default
+
+        for row in reader:
+            process = {name: row[i] for name, i in copied}
+            for name, i, convert in converted:
+                process[name] = convert(row[i])
+            process.update(constant)
+            yield process
+
+def parse_percent_value(value):
+    """Convert percentages such as '98.5%' to floats"""
+    return float(value.rstrip("%"))
 
 def parse_memory_value(value):
     """Convert memory values to numeric values in MB"""
@@ -121,11 +231,8 @@ def parse_memory_value(value):
         return None
     try:
         num, unit = value.split()
-        num = float(num)
-        unit = unit.upper()
-        conversion_factors = {"KB": 1/1024, "MB": 1, "GB": 1024, "TB": 1024**2}
-        return num * conversion_factors.get(unit, 1)  
-    except Exception:
+        return float(num) * MEMORY_UNITS.get(unit.upper(), 1)
+    except ValueError:
         return None
 
 # Convert BCO process id to process id format used in the trace file
@@ -133,11 +240,22 @@ def extract_process_id(name: str) -> str:
     return f"{name[:2]}/{name[2:8]}"
 
 def get_file_xxhash128(filename):
+    h = xxhash.xxh128()
     with open(filename, 'rb', buffering=0) as f:
-        h = xxhash.xxh128()
-        # Read the file in chunks to avoid memory issues with large files
-        for chunk in iter(lambda: f.read(4096), b""):
-            h.update(chunk)
+        if os.fstat(f.fileno()).st_size == 0:
+            # Empty files can't be mapped
+            return h.hexdigest()
+        try:
+            # Hash straight from the page cache instead of copying the file through Python in chunks
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                if hasattr(mmap, "MADV_SEQUENTIAL"):
+                    mm.madvise(mmap.MADV_SEQUENTIAL)
+                h.update(mm)
+        except (OSError, ValueError, OverflowError):
+            # Fall back to reading in large chunks, e.g. when the file doesn't fit in the address space
+            h.reset()
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                h.update(chunk)
         return h.hexdigest()
 
 def get_directory_xxhash128(dirname):
@@ -146,72 +264,210 @@ def get_directory_xxhash128(dirname):
         for filename in filenames:
             files.append(os.path.join(root, filename))
     files.sort()
-    
-    xxhash_values = []
-    for file in files:
+
+    def hash_file(file):
         try:
-            file_hash = xxhash.xxh128()
-            with open(file, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
-                    file_hash.update(chunk)
-            xxhash_values.append(f"{file_hash.hexdigest()} {file}")
+            return get_file_xxhash128(file)
         except Exception as e:
             print(f"Skipping {file}: {e}")
+            return None
+
+    # Hash files concurrently: reads and xxhash's C loop don't hold the GIL
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+        file_hashes = list(executor.map(hash_file, files))
+    xxhash_values = [f"{file_hash} {file}" for file_hash, file in zip(file_hashes, files) if file_hash is not None]
     
     final_hash = xxhash.xxh128()
     for line in xxhash_values:
         final_hash.update(line.encode())
     return final_hash.hexdigest()
 
+@lru_cache(maxsize=None)
+def get_hash_cache_db():
+    """Open the persistent digest cache, or return None if it can't be used"""
+    try:
+        HASH_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(HASH_CACHE_PATH, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        db.execute("""CREATE TABLE IF NOT EXISTS file_hashes (
+            device INTEGER, inode INTEGER, size INTEGER, mtime_ns INTEGER, xxhash128 TEXT NOT NULL,
+            PRIMARY KEY (device, inode, size, mtime_ns))""")
+        return db
+    except (OSError, sqlite3.Error) as e:
+        typer.echo(f"Hash cache disabled: {e}", err=True)
+        return None
+
+def disable_hash_cache(error):
+    """Hash without the persistent cache for the rest of the run, e.g. when it is locked or read-only"""
+    global hash_cache_disabled
+    hash_cache_disabled = True
+    typer.echo(f"Hash cache disabled: {error}", err=True)
+
+def get_cached_file_xxhash128(filename):
+    """Hash a file, skipping the work when the same file version was hashed before"""
+    stat = os.stat(filename)
+    key = (stat.st_dev, stat.st_ino, stat.st_size, stat.st_mtime_ns)
+    if key in file_hash_cache:
+        return file_hash_cache[key]
+
+    db = None if hash_cache_disabled else get_hash_cache_db()
+    row = None
+    if db:
+        try:
+            row = db.execute("SELECT xxhash128 FROM file_hashes WHERE device = ? AND inode = ? AND size = ? AND mtime_ns = ?", key).fetchone()
+        except sqlite3.Error as e:
+            disable_hash_cache(e)
+            db = None
+    if row:
+        digest = row[0]
+    else:
+        digest = get_file_xxhash128(filename)
+        if db:
+            try:
+                db.execute("INSERT OR REPLACE INTO file_hashes VALUES (?, ?, ?, ?, ?)", (*key, digest))
+                db.commit()
+            except sqlite3.Error as e:
+                disable_hash_cache(e)
+    file_hash_cache[key] = digest
+    return digest
+
 def get_obj_xxhash128(obj):
     parsed_url = urlparse(obj).path
     full_path = unquote(parsed_url)
     if os.path.isfile(full_path):
-        return get_file_xxhash128(full_path)
+        return get_cached_file_xxhash128(full_path)
     elif os.path.isdir(full_path):
         return get_directory_xxhash128(full_path)
     else:
         return None
 
 # Extract provenance from BCO file
-def get_provenance_data(bco_data):
+def get_provenance_data(bco_file: Path):
     process_executions_inputs = []
     process_executions_outputs = []
 
-    for step in bco_data.get("description_domain", {}).get("pipeline_steps", []):
-        process_id = extract_process_id(step["name"])
+    # Pipeline steps are read one at a time rather than loading the whole BCO
+    with open(bco_file, "rb") as f:
+        for step in ijson.items(f, "description_domain.pipeline_steps.item"):
+            process_id = extract_process_id(step["name"])
     
-        input_files = list(set([file["uri"] for file in step.get("input_list", [])]))
-        output_files = list(set([file["uri"] for file in step.get("output_list", [])]))
+            input_files = list(set([file["uri"] for file in step.get("input_list", [])]))
+            output_files = list(set([file["uri"] for file in step.get("output_list", [])]))
     
-        for input_file in input_files:
-            if input_file.startswith(('http://', 'https://')):
-                xxhash128 = None
-            else:
-                xxhash128 = get_obj_xxhash128(input_file)  
-            process_executions_inputs.append({
-                "process_execution_id": process_id,
-                "filename": input_file,
-                "xxhash128": xxhash128,  
-            })
-        for output_file in output_files:
-            xxhash128 = get_obj_xxhash128(output_file)  
-            process_executions_outputs.append({
-                "process_execution_id": process_id,
-                "filename": output_file,
-                "xxhash128": xxhash128, 
-            })
+            for input_file in input_files:
+                if input_file.startswith(('http://', 'https://')):
+                    xxhash128 = None
+                else:
+                    xxhash128 = get_obj_xxhash128(input_file)  
+                process_executions_inputs.append({
+                    "process_execution_id": process_id,
+                    "filename": input_file,
+                    "xxhash128": xxhash128,  
+                })
+            for output_file in output_files:
+                xxhash128 = get_obj_xxhash128(output_file)  
+                process_executions_outputs.append({
+                    "process_execution_id": process_id,
+                    "filename": output_file,
+                    "xxhash128": xxhash128, 
+                })
 
     return (process_executions_inputs, process_executions_outputs)
 
 
 
+def batched(items, size):
+    """Yield consecutive lists of at most size items"""
+    iterator = iter(items)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+async def submit_executions(log_file: Path, bco_file: Path, headers: dict, verbose: bool = False):
+    """Send workflow, process and file records to the API, overlapping independent requests"""
+    # One client for the whole run, so requests reuse pooled keep-alive connections;
+    # the pool holds exactly as many connections as requests can be in flight
+    limits = httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS, max_keepalive_connections=MAX_CONCURRENT_REQUESTS)
+    async with httpx.AsyncClient(base_url=API_BASE_URL, headers=headers, timeout=None, limits=limits) as client:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+        async def post(path, data):
+            async with semaphore:
+                # Encode with orjson; the Content-Type header is set on the client
+                return await client.post(path, content=orjson.dumps(data))
+
+        async def post_batches(path, rows):
+            """Send rows to a bulk endpoint in concurrent batches; returns how many
+            rows were sent, or None if any batch was rejected"""
+            # Batches are built in a worker thread and handed over through a bounded
+            # queue, so reading the next rows overlaps with the requests in flight
+            queue = asyncio.Queue(maxsize=MAX_CONCURRENT_REQUESTS)
+            batches = batched(rows, BULK_BATCH_SIZE)
+            # Set on the first rejected batch: reading stops and queued batches are dropped
+            failed = asyncio.Event()
+
+            async def produce():
+                count = 0
+                while not failed.is_set() and (batch := await asyncio.to_thread(next, batches, None)):
+                    await queue.put(batch)
+                    count += len(batch)
+                for _ in range(MAX_CONCURRENT_REQUESTS):
+                    await queue.put(None)
+                return count
+
+            async def consume():
+                while (batch := await queue.get()) is not None:
+                    if failed.is_set():
+                        continue
+                    response = await post(path, batch)
+                    if verbose:
+                        typer.echo(f"{path}: {len(batch)} rows, status {response.status_code}")
+                    if response.status_code != 200:
+                        failed.set()
+
+            (count, *_) = await asyncio.gather(produce(), *(consume() for _ in range(MAX_CONCURRENT_REQUESTS)))
+            return None if failed.is_set() else count
+
+        # Get workflow execution data and submit to API
+        workflow_execution_data = get_nextflow_log(log_file, bco_file)
+        response = await post("/workflows/", workflow_execution_data)
+        if response.status_code != 200:
+            typer.echo("Failed to submit workflow execution", err=True)
+            return
+        typer.echo("Workflow execution submitted successfully")
+
+        # Get process execution data and submit to API
+        trace_file = get_trace_filepath(log_file)
+        typer.echo (f"Processing trace file: {trace_file}")
+        workflow_id = workflow_execution_data["id"]
+        process_execution_data = get_process_execution_data(trace_file, workflow_id)
+        processes_submitted = await post_batches("/processes/bulk", process_execution_data)
+        if processes_submitted is None:
+            typer.echo("Failed to submit process executions", err=True)
+            return
+        typer.echo(f"All process executions submitted successfully ({processes_submitted})")
+
+        # Get provenance data and submit to API; input and output files only
+        # depend on the process executions, so both are sent concurrently
+        typer.echo (f"Processing provenance file: {bco_file}") 
+        (file_inputs, file_outputs) = get_provenance_data(bco_file)
+        (inputs_submitted, outputs_submitted) = await asyncio.gather(
+            post_batches("/input_files/bulk", file_inputs),
+            post_batches("/output_files/bulk", file_outputs),
+        )
+        if inputs_submitted is None:
+            typer.echo("Failed to submit input files", err=True)
+            return
+        typer.echo(f"Input files submitted successfully ({inputs_submitted})")
+        if outputs_submitted is None:
+            typer.echo("Failed to submit output files", err=True)
+            return
+        typer.echo(f"Output files submitted successfully ({outputs_submitted})")
+        typer.echo("All input and output files submitted successfully")
+
 @app.command()
-def submit(log_file: Path, bco_file: Path, api_key: str = typer.Option(None, help="API key for authentication")):
+def submit(log_file: Path, bco_file: Path, api_key: str = typer.Option(None, help="API key for authentication"), verbose: bool = typer.Option(False, "--verbose", help="Report every batch sent to the API")):
     """Submit Nextflow workflow and process execution information to GW-RePO API"""
-    with open(bco_file, "r") as f:
-        bco_data = json.load(f)
-
     # Get API key from environment if not provided
     if api_key is None:
         api_key = os.getenv("API_KEY")
@@ -225,43 +481,7 @@ def submit(log_file: Path, bco_file: Path, api_key: str = typer.Option(None, hel
         "Content-Type": "application/json"
     }
 
-    # Get workflow execution data and submit to API
-    workflow_execution_data = get_nextflow_log(log_file, bco_data)
-    response = requests.post(f"{API_BASE_URL}/workflows/", json=workflow_execution_data, headers=headers)
-    if response.status_code != 200:
-        typer.echo("Failed to submit workflow execution", err=True)
-        return
-    typer.echo("Workflow execution submitted successfully")
-
-    # Get process execution data and submit to API
-    trace_file = get_trace_filepath(log_file)
-    typer.echo (f"Processing trace file: {trace_file}")
-    workflow_id = workflow_execution_data["id"]
-    process_execution_data = get_process_execution_data(trace_file, workflow_id)
-    for entry in process_execution_data:
-        response = requests.post(f"{API_BASE_URL}/processes/", json=entry, headers=headers)
-        if response.status_code != 200:
-            typer.echo(f"Failed to submit process execution: {entry['process_name']}", err=True)
-            return
-        typer.echo(f"Process execution submitted successfully: {entry['process_name']}")
-    typer.echo("All process executions submitted successfully")
-
-    # Get provenance data and submit to API
-    typer.echo (f"Processing provenance file: {bco_file}") 
-    (file_inputs, file_outputs) = get_provenance_data(bco_data)
-    for entry in file_inputs:
-        response = requests.post(f"{API_BASE_URL}/input_files/", json=entry, headers=headers)
-        if response.status_code != 200:
-            typer.echo(f"Failed to submit input files: {entry['filename']}", err=True)
-            return
-        typer.echo(f"Input files submitted successfully: {entry['filename']}")
-    for entry in file_outputs:
-        response = requests.post(f"{API_BASE_URL}/output_files/", json=entry, headers=headers)
-        if response.status_code != 200:
-            typer.echo(f"Failed to submit output files: {entry['filename']}", err=True)
-            return
-        typer.echo(f"Output files submitted successfully: {entry['filename']}")
-    typer.echo("All input and output files submitted successfully")
+    asyncio.run(submit_executions(log_file, bco_file, headers, verbose))
 
 if __name__ == "__main__":
     app()